@@ -1,7 +1,18 @@
+import contextlib
+import copy
 import dataclasses
+import decimal
 import functools
-import operator
+import itertools
+import queue
+import random
+import re
+import threading
+import time
+import types
 import unittest
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from itertools import zip_longest
 import typing as ty
 
@@ -9,8 +20,11 @@ import boto3  # type: ignore
 
 # for easy access
 from boto3.dynamodb.conditions import Key, Attr  # type: ignore
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder  # type: ignore
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer  # type: ignore
 
 # sentinal values
+from botocore.config import Config  # type: ignore
 from botocore.exceptions import ClientError
 
 
@@ -32,60 +46,566 @@ class Sentinal:
 PRIMARY_KEY = Sentinal("Primary Key")
 REMOVE_KEY = Sentinal("Remove Key")
 MISSING_KEY = Sentinal("Missing Key")
+_PAGES_DONE = Sentinal("Pages Done")
 
 
 class DoesNotExist(Exception):
     pass
 
 
-def itemdict(item) -> ty.Dict:
+class UnprocessedItems(Exception):
+    """
+    Raised when dynamodb still hasn't processed some of a batch's requests
+    after retrying. The requests are available as .unprocessed.
+    """
+
+    def __init__(self, unprocessed):
+        super().__init__(f"dynamodb left {sum(map(len, unprocessed.values()))} batch requests unprocessed")
+        self.unprocessed = unprocessed
+
+
+# Enough pooled connections for the threads used by clear/find_parallel, kept
+# alive between requests. Retries are botocore's standard ones: a few attempts
+# so an unreachable endpoint fails quickly, the batch methods retry unprocessed
+# items on their own. Connecting times out well under botocore's 60s default so
+# a dead endpoint is retried rather than hanging, but reads keep the default so
+# slow scans and batches aren't cut off. Anything set in a config passed to
+# configure() takes precedence.
+DEFAULT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=5,
+    retries={"max_attempts": 3, "mode": "standard"},
+)
+
+
+def _with_default_config(resource_kwargs: ty.FrozenSet[ty.Tuple[str, ty.Any]]) -> ty.Dict[str, ty.Any]:
+    kwargs = dict(resource_kwargs)
+    config = kwargs.get("config")
+    kwargs["config"] = DEFAULT_CONFIG if config is None else DEFAULT_CONFIG.merge(config)
+    return kwargs
+
+
+# boto3's default session isn't thread-safe and lru_cache doesn't stop two threads
+# building the same value at once, so resources and clients are made one at a time
+_boto3_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_resource(resource_kwargs: ty.FrozenSet[ty.Tuple[str, ty.Any]]):
+    # boto3 resources are expensive to build (loader, service model, event
+    # registration), so share one per distinct set of resource kwargs
+    return boto3.resource("dynamodb", **_with_default_config(resource_kwargs))
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_client(resource_kwargs: ty.FrozenSet[ty.Tuple[str, ty.Any]]):
+    # a plain client, unlike resource.meta.client it doesn't (de)serialize
+    # attribute values for us, so we can skip the resource layer on hot writes
+    return boto3.client("dynamodb", **_with_default_config(resource_kwargs))
+
+
+def _get_resource(resource_kwargs: ty.FrozenSet[ty.Tuple[str, ty.Any]]):
+    with _boto3_lock:
+        return _cached_resource(resource_kwargs)
+
+
+def _get_client(resource_kwargs: ty.FrozenSet[ty.Tuple[str, ty.Any]]):
+    with _boto3_lock:
+        return _cached_client(resource_kwargs)
+
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _serialize(d: ty.Dict[str, ty.Any]) -> ty.Dict[str, ty.Any]:
+    # drops MISSING_KEY values as it goes so callers don't need a separate itemdict pass
+    return {k: _serializer.serialize(v) for k, v in d.items() if v is not MISSING_KEY}
+
+
+def _deserialize(d: ty.Dict[str, ty.Any]) -> ty.Dict[str, ty.Any]:
+    return {k: _deserializer.deserialize(v) for k, v in d.items()}
+
+
+def serialize(item) -> ty.Dict[str, ty.Dict[str, ty.Any]]:
+    """
+    Converts an item (dict or dataclass) to dynamodb's wire format, e.g.
+    {"id": {"S": "1"}}, for use with Table.put_raw.
+    """
+    return _serialize(_rawdict(item))
+
+
+class _cached_property:
+    """
+    Computes the value on first access, then stores it on the instance so later
+    lookups never reach the descriptor (functools.cached_property needs 3.8+).
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
+@functools.lru_cache(maxsize=None)
+def _fields_of(cls: type) -> ty.Tuple[str, ...]:
+    return tuple(f.name for f in dataclasses.fields(cls))
+
+
+def _rawdict(item) -> ty.Dict:
     if isinstance(item, dict):
-        d = item
+        return item
     elif hasattr(item, "asdict"):
-        d = item.asdict()
-    else:
-        d = dataclasses.asdict(item)
+        return item.asdict()
+    # a shallow unpack, dataclasses.asdict deep copies every list/dict value. Nested
+    # dataclasses still need converting since boto3 can't serialize them
+    return {name: _undataclass(getattr(item, name)) for name in _fields_of(type(item))}
+
+
+# the common attribute types, which never need converting
+_SCALAR_TYPES = frozenset((str, int, float, bool, bytes, decimal.Decimal, type(None)))
+
+
+def _undataclass(value):
+    """
+    Converts any dataclasses in value, including inside lists, tuples and dicts, to
+    dicts. Returns value itself, not a copy, if there aren't any.
+    """
+    if type(value) in _SCALAR_TYPES:
+        return value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (list, tuple)):
+        converted = [_undataclass(v) for v in value]
+        if any(c is not v for c, v in zip(converted, value)):
+            return converted if isinstance(value, list) else tuple(converted)
+    elif isinstance(value, dict):
+        converted_values = {k: _undataclass(v) for k, v in value.items()}
+        if any(converted_values[k] is not v for k, v in value.items()):
+            return converted_values
+    return value
+
+
+def itemdict(item) -> ty.Dict:
+    """
+    Returns the item as a dict without any MISSING_KEY values. Plain dicts that
+    don't contain MISSING_KEY are returned as-is (not copied) so don't mutate the result.
+    """
+    d = _rawdict(item)
+    if not any(v is MISSING_KEY for v in d.values()):
+        return d
     return {k: v for (k, v) in d.items() if v is not MISSING_KEY}
 
 
+def _chunked(iterable: ty.Iterable, size: int) -> ty.Generator[ty.List, None, None]:
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _build_conditions(params: ty.Dict[str, ty.Any]) -> ty.Dict[str, ty.Any]:
+    """
+    Renders any boto3 condition objects in query/scan params to expression strings.
+
+    boto3 would otherwise rebuild them on every page, using a placeholder counter
+    that's shared by everything calling the same client, which isn't safe once
+    requests are being made from several threads.
+    """
+    builder = ConditionExpressionBuilder()
+    names: ty.Dict[str, str] = {}
+    values: ty.Dict[str, ty.Any] = {}
+    params = dict(params)
+    for param, is_key_condition in (("KeyConditionExpression", True), ("FilterExpression", False)):
+        condition = params.get(param)
+        compiled = None
+        if isinstance(condition, tuple):
+            # compiled expressions alongside a condition still to build, see Table._add_filter
+            compiled, condition = condition
+        if isinstance(condition, ConditionBase):
+            built = builder.build_expression(condition, is_key_condition=is_key_condition)
+            if compiled:
+                params[param] = f"({compiled}) AND ({built.condition_expression})"
+            else:
+                params[param] = built.condition_expression
+            names.update(built.attribute_name_placeholders)
+            values.update(built.attribute_value_placeholders)
+    if names:
+        params["ExpressionAttributeNames"] = {**params.get("ExpressionAttributeNames", {}), **names}
+    if values:
+        params["ExpressionAttributeValues"] = {**params.get("ExpressionAttributeValues", {}), **values}
+    return params
+
+
+class CompiledCondition(ty.NamedTuple):
+    expression: str
+    names: ty.Mapping[str, str]
+    values: ty.Mapping[str, ty.Any]
+
+
+# numbers compiled conditions' placeholders (#cN / :cN) so that no two compiled
+# conditions share one, and any of them can be used in the same request
+_compiled_placeholder_ids = itertools.count()
+
+
+def compile_condition(condition: ConditionBase) -> CompiledCondition:
+    """
+    Renders a constant Key/Attr condition to an expression string once, so a condition
+    that's used over and over doesn't need to go through boto3's condition builder each
+    time. Pass the result to find/count/clear anywhere a condition is accepted.
+
+    The condition's values are baked into the result, so only compile conditions whose
+    values don't change between calls; pass conditions built per call as they are.
+    """
+    built = ConditionExpressionBuilder().build_expression(condition)
+    # swap boto3's placeholders for our own rather than relying on its internals to name them
+    renamed = {
+        placeholder: f"{placeholder[0]}c{next(_compiled_placeholder_ids)}"
+        for placeholder in itertools.chain(built.attribute_name_placeholders, built.attribute_value_placeholders)
+    }
+    return CompiledCondition(
+        re.sub(r"[#:]\w+", lambda m: renamed.get(m.group(), m.group()), built.condition_expression),
+        types.MappingProxyType({renamed[p]: name for p, name in built.attribute_name_placeholders.items()}),
+        types.MappingProxyType({renamed[p]: value for p, value in built.attribute_value_placeholders.items()}),
+    )
+
+
+def _add_compiled(params: ty.Dict[str, ty.Any], param: str, conditions: ty.Sequence[CompiledCondition]) -> None:
+    if len(conditions) == 1:
+        params[param] = conditions[0].expression
+    else:
+        params[param] = " AND ".join(f"({c.expression})" for c in conditions)
+    for c in conditions:
+        params["ExpressionAttributeNames"] = {**params.get("ExpressionAttributeNames", {}), **c.names}
+        params["ExpressionAttributeValues"] = {**params.get("ExpressionAttributeValues", {}), **c.values}
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_key_builder(key_attrs: ty.Tuple[str, ...]) -> ty.Callable[[ty.Dict[str, ty.Any]], ty.Dict[str, ty.Any]]:
+    """
+    Generates a function that picks key_attrs out of a dict, i.e. for ("id", "ts"):
+
+        def build_key(kw): return {'id': kw['id'], 'ts': kw['ts']}
+
+    Raises KeyError if one of them is missing.
+    """
+    fields = ", ".join(f"{attr!r}: kw[{attr!r}]" for attr in key_attrs)
+    namespace: ty.Dict[str, ty.Any] = {}
+    exec(f"def build_key(kw): return {{{fields}}}", namespace)
+    return namespace["build_key"]
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_equalities(attrs: ty.Tuple[str, ...], prefix: str) -> ty.Tuple[str, ty.Dict[str, str], ty.Tuple[str, ...]]:
+    """
+    Builds an "a = x AND b = y" expression over attrs, once per set of attributes,
+    without going through boto3's condition builder. Returns the expression, its
+    attribute names, and the value placeholders (in attrs order) for the caller
+    to fill in. Placeholders are named #<prefix>N and :<prefix>N so expressions
+    with different prefixes can share a request.
+    """
+    names = {f"#{prefix}{i}": attr for i, attr in enumerate(attrs)}
+    placeholders = tuple(f":{prefix}{i}" for i in range(len(attrs)))
+    expression = " AND ".join(f"{name} = {value}" for name, value in zip(names, placeholders))
+    return expression, names, placeholders
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_update(
+    set_attrs: ty.Tuple[str, ...], remove_attrs: ty.Tuple[str, ...]
+) -> ty.Tuple[str, ty.Dict[str, str], ty.Tuple[str, ...]]:
+    """
+    Builds an UpdateExpression that sets set_attrs and removes remove_attrs, once
+    per shape of update. Returns the expression, its attribute names, and the value
+    placeholders (in set_attrs order) for the caller to fill in.
+    """
+    set_names = [f"#a{i}" for i in range(len(set_attrs))]
+    remove_names = [f"#r{i}" for i in range(len(remove_attrs))]
+    placeholders = tuple(f":v{i}" for i in range(len(set_attrs)))
+
+    clauses = []
+    if set_attrs:
+        clauses.append("SET " + ", ".join(f"{name} = {value}" for name, value in zip(set_names, placeholders)))
+    if remove_attrs:
+        clauses.append("REMOVE " + ", ".join(remove_names))
+    names = {**dict(zip(set_names, set_attrs)), **dict(zip(remove_names, remove_attrs))}
+    return " ".join(clauses), names, placeholders
+
+
+def _eq(attr: str, value: ty.Any, condition: ty.Type = Attr) -> ConditionBase:
+    # lets callers pass their own condition for an attribute, e.g. find(age=Attr("age").gt(21))
+    return value if isinstance(value, ConditionBase) else condition(attr).eq(value)
+
+
+def _is_key_condition(attr: str, value: ty.Any, hash_key: bool) -> bool:
+    """
+    Whether a find() keyword value can go in a KeyConditionExpression: a plain value,
+    or a Key condition on attr itself (and only an equality for the hash key).
+    """
+    if not isinstance(value, ConditionBase):
+        return True
+    expression = value.get_expression()
+    key = expression["values"][0]
+    if not isinstance(key, Key) or key.name != attr:
+        return False
+    return not hash_key or expression["operator"] == "="
+
+
+def _pages_in_background(page_iters: ty.Sequence[ty.Iterator], maxsize: int) -> ty.Generator[ty.Any, None, None]:
+    """
+    Runs each page iterator on its own thread, yielding pages as they arrive. At
+    most maxsize pages are buffered, so the threads stay only a little ahead of
+    the caller. Exceptions raised by an iterator are re-raised here.
+    """
+    results: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def produce(pages: ty.Iterator) -> None:
+        try:
+            for page in pages:
+                if stop.is_set():
+                    break
+                results.put(page)
+        except Exception as e:
+            results.put(e)
+        finally:
+            results.put(_PAGES_DONE)
+
+    with ThreadPoolExecutor(max_workers=len(page_iters)) as executor:
+        for pages in page_iters:
+            executor.submit(produce, pages)
+
+        remaining = len(page_iters)
+        try:
+            while remaining:
+                page = results.get()
+                if page is _PAGES_DONE:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield page
+        finally:
+            # if we're stopping early, unblock any threads waiting on the queue so they can exit
+            stop.set()
+            while remaining:
+                if results.get() is _PAGES_DONE:
+                    remaining -= 1
+
+
+def _backoff(attempt: int) -> None:
+    # jittered exponential backoff before retrying the parts of a batch dynamodb didn't process
+    time.sleep(random.uniform(0.5, 1.0) * 2 ** min(attempt, 5))
+
+
+def _and_all(conditions: ty.Iterable[ty.Any]) -> ty.Any:
+    """
+    ANDs together a stream of boto3 conditions, returns None if there weren't any
+    """
+    it = iter(conditions)
+    condition = next(it, None)
+    for c in it:
+        condition = condition & c
+    return condition
+
+
+def _key_names(key_schema: ty.Iterable[ty.Dict[str, str]]) -> ty.Tuple[str, ...]:
+    # hash key first, DescribeTable doesn't promise to list the key schema in that order
+    return tuple(k["AttributeName"] for k in sorted(key_schema, key=lambda k: k["KeyType"] != "HASH"))
+
+
 T = ty.TypeVar("T", ty.Dict[str, ty.Any], ty.Any)
 
+# BatchWriteItem accepts at most 25 requests per call, BatchGetItem 100 keys
+BATCH_WRITE_SIZE = 25
+BATCH_GET_SIZE = 100
+BATCH_WRITE_WORKERS = 16
+BATCH_MAX_ATTEMPTS = 10
+
 
 class Table(ty.Generic[T]):
-    def __init__(self, table_name: str, item_type: ty.Type[T] = dict, **kwargs):
-        dynamodb = boto3.resource("dynamodb", **kwargs)
+    # limits for the items cached by get(cache=True)
+    get_cache_size: int = 1024
+    get_cache_ttl: float = 5.0
+    # how long creation_date_time and item_count reuse a DescribeTable response
+    describe_ttl: float = 60.0
+
+    def __init__(self, table_name: str, item_type: ty.Type[T] = dict, _resource=None, **kwargs):
+        resource_kwargs = frozenset(kwargs.items())
+        dynamodb = _resource if _resource is not None else _get_resource(resource_kwargs)
         self.item_type: ty.Type[T] = item_type
         self.table = dynamodb.Table(table_name)
+        self._client = _get_client(resource_kwargs)
         self.DoesNotExist = type(f"DoesNotExist", (DoesNotExist,), {})
+        # primary key values -> (time fetched, item)
+        self._get_cache: ty.OrderedDict[tuple, ty.Tuple[float, ty.Dict[str, ty.Any]]] = OrderedDict()
+        self._get_cache_lock = threading.Lock()
+        # (time fetched, DescribeTable response)
+        self._described: ty.Optional[ty.Tuple[float, ty.Dict[str, ty.Any]]] = None
 
     def __repr__(self):
         return f"<Table: {self.table.name}>"
 
+    # The key schema and indexes come from DescribeTable, snapshot them the first
+    # time they're needed rather than going through the boto3 resource every call
+    @_cached_property
+    def _key_schema(self) -> ty.List[ty.Dict[str, str]]:
+        return list(self.table.key_schema)
+
+    @_cached_property
+    def _key_attrs(self) -> ty.Tuple[str, ...]:
+        return _key_names(self._key_schema)
+
+    @_cached_property
+    def _build_key(self) -> ty.Callable[[ty.Dict[str, ty.Any]], ty.Dict[str, ty.Any]]:
+        return _compile_key_builder(self._key_attrs)
+
+    @_cached_property
+    def _gsi_by_name(self) -> ty.Dict[str, ty.Dict[str, ty.Any]]:
+        return {idx["IndexName"]: idx for idx in self.table.global_secondary_indexes or []}
+
+    @_cached_property
+    def _gsi_keys(self) -> ty.Dict[str, ty.Tuple[str, ...]]:
+        return {name: _key_names(idx["KeySchema"]) for (name, idx) in self._gsi_by_name.items()}
+
+    def _describe(self) -> ty.Dict[str, ty.Any]:
+        described = self._described
+        if described is None or time.monotonic() - described[0] >= self.describe_ttl:
+            described = (time.monotonic(), self._client.describe_table(TableName=self.table.name)["Table"])
+            self._described = described
+        return described[1]
+
+    @property
+    def creation_date_time(self):
+        return self._describe()["CreationDateTime"]
+
+    @property
+    def item_count(self) -> int:
+        """
+        dynamodb only updates this about every 6 hours, and it's cached here for
+        describe_ttl seconds on top of that.
+        """
+        return self._describe()["ItemCount"]
+
     def __str__(self):
-        return f"{self.table.name} ({self.table.creation_date_time:%Y-%m-%d}, {self.table.item_count} items)"
+        return f"{self.table.name} ({self.creation_date_time:%Y-%m-%d}, {self.item_count} items)"
 
-    def get(self, **kwargs) -> T:
-        dynamo_key = {}
-        for k in self.table.key_schema:
-            if k["AttributeName"] not in kwargs:
-                raise ValueError(
-                    f"table.get was missing {k['KeyType']} key, {k['AttributeName']} for table {self.table.name}"
-                )
-            else:
-                dynamo_key[k["AttributeName"]] = kwargs[k["AttributeName"]]
+    def get(self, *, cache: bool = False, **kwargs) -> T:
+        """
+        Pass cache=True to allow returning a copy of the item from an earlier
+        get(cache=True) made less than get_cache_ttl seconds ago. Writes made through
+        this Table evict the cached item, writes from anywhere else won't be seen
+        until it expires.
 
-        unexpected_kwargs = set(kwargs.keys()) - set(dynamo_key.keys())
-        if unexpected_kwargs:
+        For a table with a key attribute called cache, use
+        find(PRIMARY_KEY, Key("cache").eq(...)) instead.
+        """
+        try:
+            dynamo_key = self._build_key(kwargs)
+        except KeyError:
+            k = next(k for k in self._key_schema if k["AttributeName"] not in kwargs)
+            raise ValueError(
+                f"table.get was missing {k['KeyType']} key, {k['AttributeName']} for table {self.table.name}"
+            ) from None
+
+        if len(kwargs) != len(dynamo_key):
+            unexpected_kwargs = set(kwargs.keys()) - set(dynamo_key.keys())
             raise ValueError(f"table.get recieved unexpected keyword arguments: {unexpected_kwargs!r}")
+
+        if cache:
+            cache_key = tuple(dynamo_key.values())
+            with self._get_cache_lock:
+                cached = self._get_cache.get(cache_key)
+                if cached and time.monotonic() - cached[0] < self.get_cache_ttl:
+                    self._get_cache.move_to_end(cache_key)
+                    return self.item_type(**copy.deepcopy(cached[1]))
+
         item = self.table.get_item(Key=dynamo_key).get("Item")
         if not item:
             raise self.DoesNotExist(dynamo_key)
+
+        if cache:
+            with self._get_cache_lock:
+                self._get_cache[cache_key] = (time.monotonic(), item)
+                self._get_cache.move_to_end(cache_key)
+                while len(self._get_cache) > self.get_cache_size:
+                    self._get_cache.popitem(last=False)
+            item = copy.deepcopy(item)
         return self.item_type(**item)
 
+    def get_many(self, keys: ty.Iterable[ty.Any]) -> ty.Generator[T, None, None]:
+        """
+        Fetches items by primary key with BatchGetItem, 100 keys per request. keys
+        can be dicts of just the primary key, or whole items.
+
+        Items come back in no particular order, and keys with no item are skipped.
+        """
+        client = self.table.meta.client
+        key_attrs = self._key_attrs
+
+        def unique_keys() -> ty.Generator[ty.Dict[str, ty.Any], None, None]:
+            # BatchGetItem rejects duplicate keys, and there's no need to fetch an item twice anyway
+            seen = set()
+            for key in map(itemdict, keys):
+                key = {k: key[k] for k in key_attrs}
+                key_values = tuple(key.values())
+                if key_values not in seen:
+                    seen.add(key_values)
+                    yield key
+
+        for chunk in _chunked(unique_keys(), BATCH_GET_SIZE):
+            request_items = {self.table.name: {"Keys": chunk}}
+
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                if attempt:
+                    _backoff(attempt - 1)
+                res = client.batch_get_item(RequestItems=request_items)
+                yield from self._page_items({"Items": res["Responses"].get(self.table.name, [])})
+                request_items = res.get("UnprocessedKeys")
+                if not request_items:
+                    break
+            else:
+                raise UnprocessedItems(request_items)
+
+    def _evict(self, item: ty.Dict[str, ty.Any]) -> None:
+        # checked first so that tables not using the cache don't need the key schema
+        if self._get_cache:
+            with self._get_cache_lock:
+                self._get_cache.pop(tuple(item.get(k) for k in self._key_attrs), None)
+
     def put(self, item: T) -> T:
-        self.table.put_item(Item=itemdict(item))
+        d = _rawdict(item)
+        self._client.put_item(TableName=self.table.name, Item=_serialize(d))
+        self._evict(d)
         return item
 
+    def put_raw(self, item: ty.Dict[str, ty.Dict[str, ty.Any]]) -> None:
+        """
+        Puts an item that's already in dynamodb's wire format (see dynamesa.serialize)
+        so an item that's written over and over only needs serializing once.
+        """
+        self._client.put_item(TableName=self.table.name, Item=item)
+        if self._get_cache:
+            self._evict(_deserialize({k: item[k] for k in self._key_attrs}))
+
+    def put_many(self, items: ty.Iterable[T], workers: int = BATCH_WRITE_WORKERS) -> None:
+        """
+        Puts items with BatchWriteItem, 25 per request, from a pool of worker threads.
+        Writes aren't ordered, and dynamodb rejects a batch that puts the same key
+        twice, so don't pass more than one item with the same key.
+        """
+
+        self._batch_write_all(({"PutRequest": {"Item": itemdict(item)}} for item in items), workers)
+
     def update(self, update: dict, return_values: str = "ALL_NEW") -> ty.Union[T, dict, None]:
         """
         Takes a table and a dictionary of updates, extracts the primary key from the
@@ -93,117 +613,403 @@ class Table(ty.Generic[T]):
 
         Pass return_values="NONE" if you don't care what the resulting record is.
         """
+        return self._update(update, return_values, key_only=False)
+
+    def upsert(self, item: T, return_values: str = "ALL_NEW") -> ty.Union[T, dict, None]:
+        """
+        Like update, but also accepts an item with nothing but its primary key. Either
+        way it's a single UpdateItem that creates the item if it doesn't exist yet, and
+        unlike put, leaves attributes that aren't in item alone if it does.
+        """
+        return self._update(item, return_values, key_only=True)
+
+    def _update(self, update, return_values: str, key_only: bool) -> ty.Union[T, dict, None]:
         table = self.table
         orig_update = update
-        update = itemdict(update).copy()
+        update = itemdict(update)
         pk = {}
-        for k in table.key_schema:
+        for k in self._key_schema:
             key = k["AttributeName"]
             if key not in update:
                 raise ValueError(
-                    f"Couldn't update {table.table_name} because update dict is missing the {k['KeyType']} key, {key:!r}"
+                    f"Couldn't update {table.name} because update dict is missing the {k['KeyType']} key, {key!r}"
                 )
-            pk[key] = update.pop(key)
+            pk[key] = update[key]
 
-        if not update:
+        if len(update) == len(pk) and not key_only:
             raise ValueError("There were no updates to apply, update dict contained only the primary key")
 
-        expression_attrs = {}
-        expression_vals = {}
-        set_parts = []
-        remove_parts = []
-        for i, (key, val) in enumerate(update.items()):
-            expression_attrs[f"#a{i}"] = key
-            if val is MISSING_KEY:
+        set_keys = []
+        set_values = []
+        removed_keys = []
+        missing, remove = MISSING_KEY, REMOVE_KEY  # local lookups are cheaper in the loop
+        for key, val in update.items():
+            if key in pk or val is missing:
                 continue
-            elif val is REMOVE_KEY:
-                if isinstance(orig_update, dict):
-                    orig_update.pop(key)
-                else:
-                    setattr(orig_update, key, MISSING_KEY)
-                remove_parts.append(f"#a{i}")
+            if val is remove:
+                removed_keys.append(key)
             else:
-                expression_vals[f":v{i}"] = val
-                set_parts.append(f"#a{i} = :v{i}")
+                set_keys.append(key)
+                set_values.append(val)
 
-        update_expression = ""
-        if set_parts:
-            update_expression += "SET " + ", ".join(set_parts)
-        if remove_parts:
-            update_expression += " REMOVE " + ", ".join(remove_parts)
+        # update may be orig_update itself, so don't mutate it until we're done iterating
+        for key in removed_keys:
+            if isinstance(orig_update, dict):
+                orig_update.pop(key)
+            else:
+                setattr(orig_update, key, MISSING_KEY)
 
         kwargs = {}
-        if expression_attrs:
-            kwargs["ExpressionAttributeNames"] = expression_attrs
-        if expression_vals:
-            kwargs["ExpressionAttributeValues"] = expression_vals
-
-        res = table.update_item(
-            Key=pk,
+        if set_keys or removed_keys:
+            update_expression, expression_attrs, placeholders = _compile_update(tuple(set_keys), tuple(removed_keys))
+            kwargs["UpdateExpression"] = update_expression
+            kwargs["ExpressionAttributeNames"] = dict(expression_attrs)
+            if set_values:
+                kwargs["ExpressionAttributeValues"] = _serialize(dict(zip(placeholders, set_values)))
+
+        res = self._client.update_item(
+            TableName=table.name,
+            Key=_serialize(pk),
             ReturnValues=return_values,
-            UpdateExpression=update_expression,
             **kwargs,
         )
+        self._evict(pk)
         item = res.get("Attributes")
+        if item is not None:
+            item = _deserialize(item)
         if return_values == "ALL_NEW":
             item = self.item_type(**item)
         return item
 
-    def find(self, *args, **kwargs) -> ty.Generator[T, None, None]:
+    def find(
+        self,
+        *args,
+        projection: ty.Optional[ty.Sequence[str]] = None,
+        page_size: ty.Optional[int] = None,
+        parallel: ty.Optional[int] = None,
+        prefetch: bool = False,
+        consistent: bool = False,
+        limit: ty.Optional[int] = None,
+        **kwargs,
+    ) -> ty.Generator[T, None, None]:
+        """
+        Pass projection=("attr1", "attr2") to only fetch those attributes of each
+        item, and page_size=N to cap how many items dynamodb reads per request.
+
+        Pass limit=N to stop after N items.
+
+        Reads are eventually consistent unless you pass consistent=True (which
+        global secondary indexes don't support).
+
+        Pass parallel=N to run scans as N concurrent segment scans, see find_parallel.
+
+        Pass prefetch=True to fetch the next page on a background thread while the
+        current one is being consumed.
+
+        Those option names can't be used as keyword filters, filter on attributes
+        called projection, page_size, parallel, prefetch, consistent or limit with
+        a condition instead, e.g. find(Attr("limit").eq(5)).
+        """
+        if parallel:
+            yield from self.find_parallel(
+                *args,
+                segments=parallel,
+                projection=projection,
+                page_size=page_size,
+                consistent=consistent,
+                limit=limit,
+                **kwargs,
+            )
+            return
+        for page in self.find_pages(
+            *args,
+            projection=projection,
+            page_size=page_size,
+            prefetch=prefetch,
+            consistent=consistent,
+            limit=limit,
+            **kwargs,
+        ):
+            yield from page
+
+    def find_pages(
+        self,
+        *args,
+        projection: ty.Optional[ty.Sequence[str]] = None,
+        page_size: ty.Optional[int] = None,
+        prefetch: bool = False,
+        consistent: bool = False,
+        limit: ty.Optional[int] = None,
+        **kwargs,
+    ) -> ty.Generator[ty.List[T], None, None]:
+        """
+        Takes the same arguments as find, but yields a list of items for each page
+        of results dynamodb returns rather than one item at a time.
+        """
+        if limit == 0:
+            return
+        operation, paginate_kwargs = self._find_params(args, kwargs, projection, page_size, consistent, limit)
+        pages = self._pages(getattr(self.table.meta.client, operation), paginate_kwargs)
+        if prefetch:
+            pages = _pages_in_background([pages], maxsize=2)
+        remaining = limit
+        for page in pages:
+            items = self._page_items(page)
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            yield items
+            if remaining == 0:
+                break
+
+    def find_parallel(
+        self,
+        *args,
+        segments: int = 4,
+        projection: ty.Optional[ty.Sequence[str]] = None,
+        page_size: ty.Optional[int] = None,
+        consistent: bool = False,
+        limit: ty.Optional[int] = None,
+        **kwargs,
+    ) -> ty.Generator[T, None, None]:
+        """
+        Takes the same arguments as find, but when find would scan, the table is
+        split into `segments` parts which are scanned concurrently from a pool of
+        threads. Items come back in no particular order.
+
+        Queries can't be split up like this, so they run just like find.
+        """
+        if limit == 0:
+            return
+        operation, paginate_kwargs = self._find_params(args, kwargs, projection, page_size, consistent, limit)
+        items = itertools.chain.from_iterable(
+            map(self._page_items, self._parallel_pages(operation, paginate_kwargs, segments))
+        )
+        yield from itertools.islice(items, limit)
+
+    def _parallel_pages(
+        self, operation: str, paginate_kwargs: ty.Dict[str, ty.Any], segments: int
+    ) -> ty.Iterator[ty.Dict[str, ty.Any]]:
+        client = self.table.meta.client
+        if operation != "scan" or segments <= 1:
+            return self._pages(getattr(client, operation), paginate_kwargs)
+
+        paginate_kwargs = _build_conditions(paginate_kwargs)
+        segment_pages = [
+            self._pages(client.scan, dict(paginate_kwargs, Segment=segment, TotalSegments=segments))
+            for segment in range(segments)
+        ]
+        return _pages_in_background(segment_pages, maxsize=2 * segments)
+
+    def count(self, *args, parallel: ty.Optional[int] = None, limit: ty.Optional[int] = None, **kwargs) -> int:
+        """
+        Takes the same arguments as find, but only returns how many items match.
+        dynamodb counts them without sending the items back.
+
+        Pass limit=N to stop counting once N items have been found, e.g. when you
+        only need to know whether there are more than N - 1.
+
+        As with find, filter on attributes called parallel or limit with a condition.
+        """
+        if limit == 0:
+            return 0
+        operation, paginate_kwargs = self._find_params(args, kwargs, limit=limit)
+        paginate_kwargs["Select"] = "COUNT"
+        count = 0
+        # closed explicitly so stopping early shuts down any segment scans right away
+        with contextlib.closing(self._parallel_pages(operation, paginate_kwargs, parallel or 1)) as pages:
+            for page in pages:
+                count += page["Count"]
+                if limit is not None and count >= limit:
+                    return limit
+        return count
+
+    def _page_items(self, page: ty.Dict[str, ty.Any]) -> ty.List[T]:
+        item_type = self.item_type
+        if item_type is dict:
+            # boto3 has already built a fresh dict for each item, no need to copy it
+            return page["Items"]
+        return [item_type(**item) for item in page["Items"]]
+
+    def _find_params(
+        self,
+        args: tuple,
+        kwargs: ty.Dict[str, ty.Any],
+        projection: ty.Optional[ty.Sequence[str]] = None,
+        page_size: ty.Optional[int] = None,
+        consistent: bool = False,
+        limit: ty.Optional[int] = None,
+    ) -> ty.Tuple[str, ty.Dict[str, ty.Any]]:
+        """
+        Works out whether a find() call is a query or a scan, returns the operation
+        name and the kwargs to call it with.
+        """
         # if the first arg is a string, it's the name of the index to use
         index_name = None
         if args and (args[0] is PRIMARY_KEY or isinstance(args[0], str)):
             index_name = args[0]
             args = args[1:]
-
-        paginate_kwargs = {}
+        elif not args and kwargs and self._key_attrs[0] in kwargs:
+            # the hash key is pinned, so query its partition instead of scanning the
+            # table. The range key is part of the key condition too if it's given.
+            # A positional filter could name key attributes, which a query can't
+            # filter on, so those calls stay scans
+            index_name = PRIMARY_KEY
+            args = (None,) + args
+
+        operation = "query" if index_name else "scan"
+        paginate_kwargs: ty.Dict[str, ty.Any] = {"ConsistentRead": consistent}
         if index_name:
             if index_name is not PRIMARY_KEY:
                 paginate_kwargs["IndexName"] = index_name
             # When there is a positional arg after the index name, it's a key condition expression
-            if args and args[0]:
-                paginate_kwargs["KeyConditionExpression"] = args[0]
-                args = args[1:]
+            key_condition = args[0] if args else None
+            args = args[1:]
+            # the index keys covered by the key condition, any other kwargs are filters
+            idx_keys: ty.Tuple[str, ...] = ()
+            if isinstance(key_condition, CompiledCondition):
+                _add_compiled(paginate_kwargs, "KeyConditionExpression", [key_condition])
+            elif key_condition is not None:
+                paginate_kwargs["KeyConditionExpression"] = key_condition
             else:
                 if index_name is PRIMARY_KEY:
-                    idx_key_schema = self.table.key_schema
+                    idx_keys = self._key_attrs
                 else:
-                    idx = next(idx for idx in self.table.global_secondary_indexes if idx["IndexName"] == index_name)
-                    idx_key_schema = idx["KeySchema"]
-                idx_keys = {a["AttributeName"] for a in idx_key_schema}
-                paginate_kwargs["KeyConditionExpression"] = functools.reduce(
-                    operator.and_, [Key(k).eq(kwargs[k]) for k in idx_keys]
-                )
-            filters = [Key(k).eq(v) for k, v in kwargs.items() if k not in idx_keys]
-            if args:
-                assert (
-                    len(args) == 1
-                ), "table.find takes at most 3 positional arguments: index name, key condition expression, and filter expression"
-                filters.append(args[0])
-            if filters:
-                paginate_kwargs["FilterExpression"] = functools.reduce(operator.and_, filters)
-        elif args or kwargs:
-            filters = [Key(k).eq(v) for k, v in kwargs.items()]
-            if args:
-                assert len(args) == 1
-                filters.append(args[0])
-            paginate_kwargs["FilterExpression"] = functools.reduce(operator.and_, filters)
-
-        client = self.table.meta.client
-        if index_name:
-            paginator = client.get_paginator("query").paginate(TableName=self.table.name, **paginate_kwargs)
+                    idx_keys = self._gsi_keys[index_name]
+                key_attrs = self._key_condition_attrs(idx_keys, kwargs)
+                if key_attrs is None:
+                    # nothing to query on, so scan the index and filter it instead
+                    operation = "scan"
+                    idx_keys = ()
+                elif any(isinstance(kwargs[k], ConditionBase) for k in key_attrs):
+                    idx_keys = key_attrs
+                    paginate_kwargs["KeyConditionExpression"] = _and_all(_eq(k, kwargs[k], Key) for k in idx_keys)
+                else:
+                    idx_keys = key_attrs
+                    expression, names, placeholders = _compile_equalities(idx_keys, "k")
+                    paginate_kwargs["KeyConditionExpression"] = expression
+                    paginate_kwargs["ExpressionAttributeNames"] = dict(names)
+                    paginate_kwargs["ExpressionAttributeValues"] = {p: kwargs[k] for p, k in zip(placeholders, idx_keys)}
+            assert (
+                len(args) <= 1
+            ), "table.find takes at most 3 positional arguments: index name, key condition expression, and filter expression"
+            self._add_filter(paginate_kwargs, {k: v for k, v in kwargs.items() if k not in idx_keys}, args)
         else:
-            paginator = client.get_paginator("scan").paginate(TableName=self.table.name, **paginate_kwargs)
-
-        for page in paginator:
-            for item in page["Items"]:
-                yield self.item_type(**item)
+            assert len(args) <= 1
+            self._add_filter(paginate_kwargs, kwargs, args)
+
+        if projection:
+            names = {f"#p{i}": attr for i, attr in enumerate(projection)}
+            paginate_kwargs["ProjectionExpression"] = ", ".join(names)
+            paginate_kwargs["ExpressionAttributeNames"] = {**paginate_kwargs.get("ExpressionAttributeNames", {}), **names}
+        if page_size:
+            paginate_kwargs["Limit"] = page_size
+        elif limit and "FilterExpression" not in paginate_kwargs:
+            # without a filter every item read is a match, so there's no need to read more than limit per page.
+            # With one, Limit would cap the items read rather than matched and only make for more requests
+            paginate_kwargs["Limit"] = limit
+
+        return operation, paginate_kwargs
+
+    @staticmethod
+    def _key_condition_attrs(idx_keys: ty.Tuple[str, ...], kwargs: ty.Dict[str, ty.Any]) -> ty.Optional[ty.Tuple[str, ...]]:
+        """
+        Returns the index keys in kwargs to build a key condition from, or None if the
+        call can't be a query: the hash key is required, and a query can't filter on
+        a key attribute, so every index key in kwargs has to fit in the key condition.
+        """
+        hash_key, range_keys = idx_keys[0], idx_keys[1:]
+        if hash_key not in kwargs or not _is_key_condition(hash_key, kwargs[hash_key], hash_key=True):
+            return None
+        range_keys = tuple(k for k in range_keys if k in kwargs)
+        if not all(_is_key_condition(k, kwargs[k], hash_key=False) for k in range_keys):
+            return None
+        return (hash_key,) + range_keys
+
+    @staticmethod
+    def _add_filter(paginate_kwargs: ty.Dict[str, ty.Any], filters: ty.Dict[str, ty.Any], args: tuple) -> None:
+        compiled = [a for a in args if isinstance(a, CompiledCondition)]
+        conditions = [a for a in args if not isinstance(a, CompiledCondition)]
+        if any(isinstance(v, ConditionBase) for v in filters.values()):
+            conditions[:0] = itertools.starmap(_eq, filters.items())
+        elif filters:
+            # plain equality filters are common enough to skip the condition builder for
+            expression, names, placeholders = _compile_equalities(tuple(filters), "f")
+            compiled.append(CompiledCondition(expression, names, dict(zip(placeholders, filters.values()))))
+
+        if not compiled:
+            if conditions:
+                paginate_kwargs["FilterExpression"] = _and_all(conditions)
+            return
+        _add_compiled(paginate_kwargs, "FilterExpression", compiled)
+        if conditions:
+            # the builder's placeholders (#n0, :v0) can't collide with compiled ones,
+            # so the rest is built along with any other conditions by _build_conditions
+            paginate_kwargs["FilterExpression"] = (paginate_kwargs["FilterExpression"], _and_all(conditions))
+
+    def _pages(self, operation, kwargs: ty.Dict[str, ty.Any]) -> ty.Generator[ty.Dict, None, None]:
+        # follows LastEvaluatedKey by hand rather than building a botocore paginator on every call
+        kwargs = _build_conditions(kwargs)
+        kwargs["TableName"] = self.table.name
+        while True:
+            page = operation(**kwargs)
+            yield page
+            if "LastEvaluatedKey" not in page:
+                break
+            kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+    def clear(self, *args, parallel: ty.Optional[int] = None, **kwargs) -> None:
+        """
+        Deletes every item find(*args, **kwargs) would return. Pass parallel=N to
+        find them with N concurrent segment scans, like find(parallel=N). As with
+        find, filter on an attribute called parallel with a condition.
+        """
+        # only the primary key is needed to delete, so don't fetch the rest of each item
+        operation, paginate_kwargs = self._find_params(args, kwargs, projection=self._key_attrs)
+        self._batch_write_all(
+            {"DeleteRequest": {"Key": key}}
+            for page in self._parallel_pages(operation, paginate_kwargs, parallel or 1)
+            for key in page["Items"]
+        )
+        with self._get_cache_lock:
+            self._get_cache.clear()
 
-    def clear(self, *args, **kwargs) -> None:
-        with self.table.batch_writer() as batch:
-            for item in self.find(*args, **kwargs):
-                item = itemdict(item)
-                batch.delete_item(Key={k["AttributeName"]: item[k["AttributeName"]] for k in self.table.key_schema})
+    def _batch_write(self, requests: ty.List[ty.Dict[str, ty.Any]]) -> None:
+        client = self.table.meta.client
+        request_items = {self.table.name: requests}
+        try:
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                if attempt:
+                    _backoff(attempt - 1)
+                res = client.batch_write_item(RequestItems=request_items)
+                request_items = res.get("UnprocessedItems")
+                if not request_items:
+                    return
+            raise UnprocessedItems(request_items)
+        finally:
+            # evicted once written (even partly), so a get(cache=True) made while the
+            # write was in flight can't leave the old item cached
+            if self._get_cache:
+                for request in requests:
+                    put = request.get("PutRequest")
+                    self._evict(put["Item"] if put else request["DeleteRequest"]["Key"])
+
+    def _batch_write_all(self, requests: ty.Iterable[ty.Dict[str, ty.Any]], workers: int = BATCH_WRITE_WORKERS) -> None:
+        """
+        Sends write requests in BatchWriteItem sized chunks from a pool of worker
+        threads. Only a bounded number of chunks are in flight at once so huge
+        request streams aren't pulled into memory all at once.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: ty.Set = set()
+            for chunk in _chunked(requests, BATCH_WRITE_SIZE):
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(self._batch_write, chunk))
+            for future in pending:
+                future.result()
 
 
 # Either (Hash key, type) or (hash key, hashkey type, range key, range key type)
@@ -211,22 +1017,51 @@ DynamesaIndexType = ty.Union[ty.Tuple[str, str], ty.Tuple[str, str, str, str]]
 
 
 class _TableGetter:
-    _resource_kwargs: ty.Dict[str, ty.Any] = {}
-    _tables: ty.Dict[ty.Tuple[str, ty.Type], Table] = {}
     table_name_prefix: str = ""
 
+    def __init__(self) -> None:
+        self._resource_kwargs: ty.Dict[str, ty.Any] = {}
+        # None means the table is known to exist but hasn't been wrapped in a Table yet
+        self._tables: ty.Dict[ty.Tuple[str, ty.Type], ty.Optional[Table]] = {}
+        # whether _tables has been filled from list_tables, rather than just holding tables we've been asked for
+        self._tables_listed = False
+        self._dynamodb = None
+
     def configure(self, **kwargs) -> None:
-        self._resource_kwargs.update(kwargs)
+        """
+        Sets the arguments used to create the boto3 resource. Calling it again with
+        the same settings is a no-op. Resources and clients are cached by their
+        settings, so switching back to an earlier configuration reuses them.
+        """
+        resource_kwargs = {**self._resource_kwargs, **kwargs}
+        if resource_kwargs == self._resource_kwargs:
+            return
+        self._resource_kwargs = resource_kwargs
+        self._dynamodb = None
+        # tables wrapped so far are bound to the old resource
+        self._tables = {}
+        self._tables_listed = False
 
     @property
     def dynamodb(self):
-        return boto3.resource("dynamodb", **self._resource_kwargs)
+        if self._dynamodb is None:
+            self._dynamodb = _get_resource(frozenset(self._resource_kwargs.items()))
+        return self._dynamodb
 
     def reload(self) -> None:
-        res = self.dynamodb.meta.client.list_tables()
+        paginator = self.dynamodb.meta.client.get_paginator("list_tables")
         self._tables = {}
-        for tablename in res["TableNames"]:
-            self._tables[tablename, dict] = Table(tablename, **self._resource_kwargs)
+        for page in paginator.paginate():
+            for tablename in page["TableNames"]:
+                self._tables[tablename, dict] = None
+        self._tables_listed = True
+
+    def _table(self, table_name: str, item_type: ty.Type[T]) -> Table[T]:
+        table = self._tables.get((table_name, item_type))
+        if table is None:
+            table = Table(table_name, item_type=item_type, _resource=self.dynamodb, **self._resource_kwargs)
+            self._tables[table_name, item_type] = table
+        return table
 
     def create(
         self,
@@ -235,7 +1070,12 @@ class _TableGetter:
         gsis: ty.Dict[str, DynamesaIndexType] = {},
         lsis: ty.Dict[str, DynamesaIndexType] = {},
         item_type: ty.Type[T] = dict,
+        wait: bool = True,
     ) -> Table[T]:
+        """
+        Pass wait=False to return without waiting for the table to become active,
+        e.g. to create several tables at once then wait for them with wait_until_exists.
+        """
         prefixed_table_name = f"{self.table_name_prefix}{table_name}"
         attribute_types = {}
 
@@ -273,37 +1113,48 @@ class _TableGetter:
                 }
             )
 
-        table = self.dynamodb.create_table(
+        # the low-level client (unlike the resource) is safe to share between threads once
+        # it's built, and building it is serialized by _get_resource
+        self.dynamodb.meta.client.create_table(
             TableName=prefixed_table_name,
             AttributeDefinitions=[{"AttributeName": k, "AttributeType": t} for k, t in attribute_types.items()],
             ProvisionedThroughput={"ReadCapacityUnits": 10, "WriteCapacityUnits": 10},
             **create_kwargs,
         )
-        table.meta.client.get_waiter("table_exists").wait(TableName=prefixed_table_name)
+        if wait:
+            self.wait_until_exists(table_name)
         return self.get(table_name, item_type)
 
-    def delete(self, table_name):
+    def delete(self, table_name, wait: bool = True):
         if isinstance(table_name, Table):
             prefixed_table_name = table_name.table.name
         else:
             prefixed_table_name = f"{self.table_name_prefix}{table_name}"
 
         self.dynamodb.meta.client.delete_table(TableName=prefixed_table_name)
-        self.dynamodb.meta.client.get_waiter("table_not_exists").wait(TableName=prefixed_table_name)
+        if wait:
+            self.dynamodb.meta.client.get_waiter("table_not_exists").wait(TableName=prefixed_table_name)
         for table_key in list(self._tables.keys()):
             if table_key[0] == prefixed_table_name:
                 self._tables.pop(table_key)
 
-    def get(self, table_name: str, item_type: ty.Type[T] = dict) -> Table[T]:
-        table_name = f"{self.table_name_prefix}{table_name}"
-        if (table_name, dict) not in self._tables:
-            self.reload()
-        if (table_name, item_type) in self._tables:
-            return self._tables[table_name, item_type]
+    def _wait(self, waiter_name: str, table_names: ty.Iterable[ty.Union[str, Table]]) -> None:
+        waiter = self.dynamodb.meta.client.get_waiter(waiter_name)
+        for table_name in table_names:
+            if isinstance(table_name, Table):
+                waiter.wait(TableName=table_name.table.name)
+            else:
+                waiter.wait(TableName=f"{self.table_name_prefix}{table_name}")
 
-        table = Table(table_name, item_type=item_type, **self._resource_kwargs)
-        self._tables[table_name, item_type] = table
-        return table
+    def wait_until_exists(self, *table_names: ty.Union[str, Table]) -> None:
+        self._wait("table_exists", table_names)
+
+    def wait_until_not_exists(self, *table_names: ty.Union[str, Table]) -> None:
+        self._wait("table_not_exists", table_names)
+
+    def get(self, table_name: str, item_type: ty.Type[T] = dict) -> Table[T]:
+        # tables are wrapped lazily, so there's no need to list them all just to get one
+        return self._table(f"{self.table_name_prefix}{table_name}", item_type)
 
     def __getattr__(self, table_name) -> Table:
         if not table_name.startswith("__"):
@@ -313,19 +1164,23 @@ class _TableGetter:
         return self.get(table_name)
 
     def __iter__(self) -> ty.Iterator[Table]:
-        if not self._tables:
+        if not self._tables_listed:
             self.reload()
-        return iter(t for t in self._tables.values() if t.table.name.startswith(self.table_name_prefix))
+        return iter(
+            self._table(table_name, item_type)
+            for (table_name, item_type) in list(self._tables)
+            if table_name.startswith(self.table_name_prefix)
+        )
 
     def __len__(self):
-        if not self._tables:
+        if not self._tables_listed:
             self.reload()
-        return len(self._tables)
+        return sum(1 for (table_name, _) in self._tables if table_name.startswith(self.table_name_prefix))
 
     def __repr__(self):
         max_table_name_len = max(len(t.table.name) for t in self)
         return "Dynamesa Tables:\n" + "\n".join(
-            f"  {t.table.name.ljust(max_table_name_len)}  ({t.table.creation_date_time:%Y-%m-%d}, {t.table.item_count} items)"
+            f"  {t.table.name.ljust(max_table_name_len)}  ({t.creation_date_time:%Y-%m-%d}, {t.item_count} items)"
             for t in self
         )
 
@@ -369,15 +1224,20 @@ class DynamoUnitTestMixin(unittest.TestCase):
     def setUp(self) -> None:
         should_replace = None
 
-        def mktable(table):
+        def mktable(table, wait=True):
             if isinstance(table, (list, tuple)):
-                tables.create(*table)
+                return tables.create(*table, wait=wait)
             elif isinstance(table, dict):
-                tables.create(**table)
+                return tables.create(**table, wait=wait)
+
+        # create the tables concurrently, then wait for them all to become active together
+        with ThreadPoolExecutor(max_workers=max(1, min(len(self.dynamesa_tables), 10))) as executor:
+            futures = [executor.submit(mktable, table, False) for table in self.dynamesa_tables]
 
-        for table in self.dynamesa_tables:
+        created = []
+        for table, future in zip(self.dynamesa_tables, futures):
             try:
-                mktable(table)
+                created.append(future.result())
             except ClientError as e:
                 if e.response["Error"]["Code"] != "ResourceInUseException":
                     raise
@@ -397,6 +1257,8 @@ class DynamoUnitTestMixin(unittest.TestCase):
                 tables.delete(table_name)
                 mktable(table)
 
+        tables.wait_until_exists(*created)
+
         if should_replace:
             tables.reload()
 
@@ -404,5 +1266,9 @@ class DynamoUnitTestMixin(unittest.TestCase):
 
     def tearDown(self) -> None:
         super().tearDown()
-        for table in tables:
-            table.table.delete()
+        # typed and untyped wrappers of the same table only need deleting once
+        to_delete = list({t.table.name: t for t in tables}.values())
+        with ThreadPoolExecutor(max_workers=max(1, min(len(to_delete), 10))) as executor:
+            for future in [executor.submit(tables.delete, table, False) for table in to_delete]:
+                future.result()
+        tables.wait_until_not_exists(*to_delete)
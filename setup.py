@@ -6,6 +6,8 @@ setup(
     py_modules=["dynamesa"],
     test_modules=["tests"],
     test_suite="tests",
+    # Config(tcp_keepalive=...) is new in botocore 1.27.84
+    install_requires=["boto3>=1.24.84", "botocore>=1.27.84"],
     author="James Robert",
     author_email="me@jiaaro.com",
     description=("A simple dynamodb client"),
@@ -1,30 +1,49 @@
-import json
 import os
 import unittest
 import subprocess
+import threading
 import typing as ty
+from unittest import mock
 from dataclasses import dataclass
 
+from botocore.exceptions import ClientError
+
 import dynamesa
 from dynamesa import Key, Attr, PRIMARY_KEY, REMOVE_KEY, MISSING_KEY
 
+# pytest-xdist workers share one dynamodb, so each gets its own tables
+WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+USER_TABLE = f"User_{WORKER}"
+
 
 def _start_dynamo_docker():
     container_name = "dynamesa-test-db"
-    inspect_container = ["docker", "container", "inspect", container_name]
-    delete_container = ["docker", "container", "rm", container_name]
-    run_container = ["docker", "run", "-d", "--name", container_name, "-p2808:8000", "amazon/dynamodb-local"]
+    quiet = dict(stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     try:
-        result = subprocess.check_output(inspect_container, stderr=subprocess.DEVNULL)
-        container_info = json.loads(result)[0]
-        if not container_info["State"]["Running"]:
-            subprocess.call(delete_container, stderr=subprocess.DEVNULL)
-            subprocess.call(run_container, stderr=subprocess.DEVNULL)
-    except:
-        try:
-            subprocess.call(run_container, stderr=subprocess.DEVNULL)
-        except:
-            pass
+        inspect = subprocess.run(
+            ["docker", "inspect", "-f", "{{.State.Running}}", container_name], capture_output=True, text=True
+        )
+        if inspect.returncode != 0:
+            # capped resources for more predictable latency, and -sharedDb so parallel
+            # test workers all see the same tables whatever region/credentials they use
+            run_container = ["docker", "run", "-d", "--name", container_name, "-p2808:8000", "--cpus=2", "--memory=512m"]
+            subprocess.run(
+                run_container + ["amazon/dynamodb-local", "-jar", "DynamoDBLocal.jar", "-inMemory", "-sharedDb"], **quiet
+            )
+        elif inspect.stdout.strip() != "true":
+            subprocess.run(["docker", "start", container_name], **quiet)
+    except FileNotFoundError:
+        # no docker, DYNAMO_ENDPOINT should point at some other dynamodb
+        pass
+
+
+SEED_USERS = [
+    {"id": "1", "ts": 1600000000, "name": "Jack Frost", "hair": "white", "nickname": "Jackie"},
+    {"id": "2", "ts": 1700000000, "name": "Frosty", "hair": "none"},
+    {"id": "3", "ts": 1500000000, "name": "Santa", "hair": "white"},
+]
+# the same users in dynamodb's wire format, serialized once for put_raw
+SERIALIZED_SEED_USERS = [dynamesa.serialize(user) for user in SEED_USERS]
 
 
 @dataclass
@@ -48,87 +67,270 @@ class DynamoTests(unittest.TestCase):
             aws_access_key_id="AKLOCAL",
             aws_secret_access_key="SKLOCAL",
         )
+        try:
+            dynamesa.tables.create(
+                USER_TABLE,
+                ("id", "S", "ts", "N"),
+                gsis={"AgeIndex": ("age", "N")},
+            )
+        except ClientError as e:
+            # left over from an earlier run, setUp empties it
+            if e.response["Error"]["Code"] != "ResourceInUseException":
+                raise
+
+        # warm up: the first request through each client pays for connection setup,
+        # get that done here rather than in a test
+        dynamesa.tables.dynamodb.meta.client.describe_table(TableName=USER_TABLE)
+        assert isinstance(dynamesa.tables.get(USER_TABLE).item_count, int)
         super().setUpClass()
 
-    def setUp(self) -> None:
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
         try:
-            dynamesa.tables.User.table.delete()
-        except:
-            pass
-        self.User = dynamesa.tables.create(
-            "User",
-            ("id", "S", "ts", "N"),
-            gsis={"AgeIndex": ("age", "N")},
-        )
+            dynamesa.tables.delete(USER_TABLE)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ResourceNotFoundException":
+                raise
 
-    def tearDown(self):
-        dynamesa.tables.delete(self.User)
+    def setUp(self) -> None:
+        # reuse one table for every test, emptying it is much faster than recreating it
+        self.User = dynamesa.tables.get(USER_TABLE)
+        self.User.clear()
 
     def assertFindResults(self, n, *findargs, **findkwargs):
-        self.assertEqual(len(list(self.User.find(*findargs, **findkwargs))), n)
+        # counting one past n is enough to tell whether there are exactly n
+        self.assertEqual(self.User.count(*findargs, limit=n + 1, **findkwargs), n)
 
     def test_dynamesa(self):
         User = self.User
 
         uid, uts = "1", 1600000000
-        User.put({"id": uid, "ts": uts, "name": "Jack Frost", "hair": "white", "nickname": "Jackie"})
-        User.put({"id": "2", "ts": 1700000000, "name": "Frosty", "hair": "none"})
-        User.put({"id": "3", "ts": 1500000000, "name": "Santa", "hair": "white"})
-
-        self.assertFindResults(3)
-
-        self.assertEqual(
-            User.get(id=uid, ts=uts)["nickname"],
-            "Jackie",
-        )
-
-        User.update(
-            {
-                "id": uid,
-                "ts": uts,
-                "age": 823,
-                "email": "jf@northpole.net",
-                "nickname": REMOVE_KEY,
-            }
-        )
-        jf = User.get(id=uid, ts=uts)
-        self.assertEqual(jf["name"], "Jack Frost")
-        self.assertNotIn("nickname", jf)
+        # Jack is seeded with an age so the index has something in it for the reads below
+        User.put_many([{**SEED_USERS[0], "age": 823}, *SEED_USERS[1:]])
+
+        # built once and reused below
+        jack_key = dynamesa.compile_condition(Key("id").eq(uid) & Key("ts").gt(500000))
+        white_hair = dynamesa.compile_condition(Attr("hair").eq("white"))
+
+        # everything that doesn't depend on the update, before making it
+        with self.subTest(phase="reads"):
+            self.assertFindResults(3)
+            self.assertEqual(
+                User.get(id=uid, ts=uts)["nickname"],
+                "Jackie",
+            )
 
-        self.assertEqual(
-            User.get(id=uid, ts=uts)["name"],
-            "Jack Frost",
+            # missing keys are skipped, and an item is only returned once
+            jack = {"id": uid, "ts": uts}
+            found = User.get_many([{"id": "2", "ts": 1700000000}, jack, {"id": "7", "ts": 1600000000}, jack])
+            self.assertEqual(sorted(u["id"] for u in found), ["1", "2"])
+
+            with self.assertRaises(User.DoesNotExist):
+                User.get(id="7", ts=1600000000)
+
+            self.assertFindResults(1, PRIMARY_KEY, id=uid, ts=uts)
+            self.assertFindResults(1, PRIMARY_KEY, jack_key)
+            self.assertFindResults(1, PRIMARY_KEY, jack_key, white_hair)
+            self.assertFindResults(2, hair="white")
+            self.assertFindResults(2, white_hair)
+            self.assertFindResults(1, white_hair, name="Santa")
+            # compiled conditions can be mixed with ones boto3 builds in the same request
+            self.assertFindResults(1, PRIMARY_KEY, Key("id").eq(uid), white_hair)
+            self.assertFindResults(0, PRIMARY_KEY, Key("id").eq("2"), white_hair)
+            self.assertFindResults(1, white_hair, name=Attr("name").begins_with("Sa"))
+
+            hairless_users = list(User.find(hair="none"))
+            self.assertEqual(len(hairless_users), 1)
+            self.assertEqual(hairless_users[0]["name"], "Frosty")
+
+            self.assertFindResults(1, "AgeIndex", age=823)
+            self.assertFindResults(0, "AgeIndex", age=123)
+            self.assertFindResults(1, "AgeIndex", Key("age").eq(823), hair="white")
+            # no age to query the index with, so it's scanned
+            self.assertFindResults(1, "AgeIndex", hair="white")
+            self.assertFindResults(0, "AgeIndex", Key("age").eq(823), hair="none")
+            self.assertFindResults(1, PRIMARY_KEY, id=Key("id").eq(uid), ts=Key("ts").gt(500000))
+            # the hash key only makes find() a query when the key condition can be built from it
+            self.assertFindResults(1, id=Attr("id").begins_with(uid))
+            self.assertFindResults(1, id=uid, ts=Attr("ts").gt(500000))
+            self.assertFindResults(1, Attr("ts").gt(500000), id=uid)
+            # dynamodb (unlike some local emulators) rejects a query filtering on a key attribute
+            with mock.patch.object(User.table.meta.client, "query", side_effect=AssertionError("queried")):
+                self.assertFindResults(1, Attr("ts").gt(500000), id=uid)
+            # conditions that can't be key conditions make it a scan of the index
+            self.assertFindResults(1, "AgeIndex", age=Attr("age").gt(800))
+            self.assertFindResults(1, "AgeIndex", age=Key("age").between(800, 900))
+
+        with self.subTest(phase="update"):
+            # update returns the item as it is after the update, no need to get it again
+            jf = User.update({"id": uid, "ts": uts, "age": 824, "email": "jf@northpole.net", "nickname": REMOVE_KEY})
+            self.assertEqual(jf["name"], "Jack Frost")
+            self.assertEqual(jf["age"], 824)
+            self.assertEqual(jf["email"], "jf@northpole.net")
+            self.assertNotIn("nickname", jf)
+            self.assertFindResults(1, "AgeIndex", age=824)
+
+            # unlike put, upsert leaves the attributes it isn't given alone
+            frosty = User.upsert({"id": "2", "ts": 1700000000, "nickname": "Snowman"})
+            self.assertEqual(frosty["name"], "Frosty")
+            self.assertEqual(frosty["nickname"], "Snowman")
+
+        with self.subTest(phase="cache"):
+            santa = {"id": "3", "ts": 1500000000}
+            self.assertEqual(User.get(**santa, cache=True)["hair"], "white")
+            User.update({**santa, "hair": "grey"})
+            self.assertEqual(User.get(**santa, cache=True)["hair"], "grey")
+            User.put({**santa, "name": "Santa", "hair": "silver"})
+            self.assertEqual(User.get(**santa, cache=True)["hair"], "silver")
+            User.put_raw(dynamesa.serialize(SEED_USERS[2]))
+            cached = User.get(**santa, cache=True)
+            self.assertEqual(cached["hair"], "white")
+
+            # each hit is a copy, changing one doesn't change the cached item
+            cached["hair"] = "blue"
+            self.assertEqual(User.get(**santa, cache=True)["hair"], "white")
+
+            User.put_many([{**SEED_USERS[2], "hair": "gold"}])
+            self.assertEqual(User.get(**santa, cache=True)["hair"], "gold")
+            User.put_many([SEED_USERS[2]])
+            self.assertEqual(User.get(**santa, cache=True)["hair"], "white")
+
+        with self.subTest(phase="background threads"):
+            self.assertEqual(len(list(User.find(parallel=3))), 3)
+            self.assertEqual(sorted(u["name"] for u in User.find(parallel=3, hair="white")), ["Jack Frost", "Santa"])
+            self.assertEqual(User.count(parallel=3, hair="white"), 2)
+
+            # prefetching a page at a time still finds everything, and can stop early too
+            self.assertEqual(len(list(User.find(prefetch=True, page_size=1))), 3)
+            self.assertEqual(len(list(User.find(prefetch=True, page_size=1, limit=2))), 2)
+
+            # stopping early shuts the segment scans down rather than leaving them blocked
+            threads = threading.active_count()
+            found = User.find(parallel=2, page_size=1)
+            next(found)
+            found.close()
+            self.assertEqual(threading.active_count(), threads)
+            found = User.find(prefetch=True, page_size=1)
+            next(found)
+            found.close()
+            self.assertEqual(threading.active_count(), threads)
+
+        with self.subTest(phase="clear"):
+            # Delete all white-haired users, finding them with two segment scans
+            User.clear(white_hair, parallel=2)
+            self.assertFindResults(1)
+
+            # Wipe table
+            User.clear()
+            self.assertFindResults(0)
+
+    def test_upsert_key_only(self):
+        # a key on its own is enough for upsert to create the item
+        key = {"id": "4", "ts": 1400000000}
+        self.assertEqual(self.User.upsert(dict(key)), key)
+        self.assertEqual(self.User.get(**key), key)
+
+    def test_limit(self):
+        self.User.put_many(SEED_USERS)
+        # nothing to read when no items are wanted
+        with mock.patch.object(self.User.table.meta.client, "scan", side_effect=AssertionError("scanned")):
+            self.assertEqual(list(self.User.find(limit=0)), [])
+            self.assertEqual(list(self.User.find(limit=0, parallel=2)), [])
+            self.assertEqual(self.User.count(limit=0), 0)
+
+        # the segment scans are shut down as soon as count has enough
+        threads = threading.active_count()
+        self.assertEqual(self.User.count(limit=1, parallel=3), 1)
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_consistent_reads(self):
+        self.User.put_many(SEED_USERS)
+        client = self.User.table.meta.client
+        with mock.patch.object(client, "query", wraps=client.query) as query:
+            self.assertEqual(len(list(self.User.find(id="1", consistent=True))), 1)
+        self.assertIs(query.call_args[1]["ConsistentRead"], True)
+        with mock.patch.object(client, "scan", wraps=client.scan) as scan:
+            self.assertEqual(len(list(self.User.find(hair="white"))), 2)
+        self.assertIs(scan.call_args[1]["ConsistentRead"], False)
+
+    def test_find_pages(self):
+        self.User.put_many(SEED_USERS)
+        pages = list(self.User.find_pages(page_size=2))
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual(sorted(u["id"] for page in pages for u in page), ["1", "2", "3"])
+        self.assertEqual([len(page) for page in self.User.find_pages(page_size=2, limit=1)], [1])
+
+    def test_projection(self):
+        self.User.put_many(SEED_USERS)
+        jack = list(self.User.find(id="1", projection=("id", "name")))
+        self.assertEqual(jack, [{"id": "1", "name": "Jack Frost"}])
+        self.assertEqual([set(u) for u in self.User.find(projection=("hair",))], [{"hair"}] * 3)
+
+    def test_describe_ttl(self):
+        users = self.User
+        self.addCleanup(delattr, users, "describe_ttl")
+        # fetched fresh, then reused until describe_ttl is up
+        users.describe_ttl = 0
+        self.assertEqual(users.item_count, 0)
+        users.describe_ttl = 60
+        self.assertEqual(users.item_count, 0)
+        users.put(SEED_USERS[0])
+        self.assertEqual(users.item_count, 0)
+        self.assertIn("0 items", str(users))
+        users.describe_ttl = 0
+        self.assertEqual(users.item_count, 1)
+        self.assertIn("1 items", str(users))
+
+    def test_configure_is_idempotent(self):
+        dynamodb, users = dynamesa.tables.dynamodb, dynamesa.tables.get(USER_TABLE)
+        dynamesa.configure(region_name="localhost")
+        self.assertIs(dynamesa.tables.dynamodb, dynamodb)
+        self.assertIs(dynamesa.tables.get(USER_TABLE), users)
+
+        # new settings mean a new resource, and tables bound to it
+        self.addCleanup(dynamesa.configure, region_name="localhost")
+        dynamesa.configure(region_name="elsewhere")
+        self.assertIsNot(dynamesa.tables.dynamodb, dynamodb)
+        self.assertIsNot(dynamesa.tables.get(USER_TABLE), users)
+
+    def test_filter_on_option_names(self):
+        self.User.put_many(
+            [
+                {"id": "1", "ts": 1, "limit": 5, "parallel": "yes"},
+                {"id": "2", "ts": 1, "limit": 6, "parallel": "no"},
+            ]
         )
-
-        with self.assertRaises(User.DoesNotExist):
-            User.get(id="7", ts=1600000000)
-
-        self.assertFindResults(1, PRIMARY_KEY, id=uid, ts=uts)
-        self.assertFindResults(1, PRIMARY_KEY, Key("id").eq(uid) & Key("ts").gt(500000))
-        self.assertFindResults(2, hair="white")
-        self.assertFindResults(2, Key("hair").eq("white"))
-        self.assertFindResults(1, "AgeIndex", age=823)
-        self.assertFindResults(0, "AgeIndex", age=123)
-
-        hairless_users = list(User.find(hair="none"))
-        self.assertEqual(len(hairless_users), 1)
-        self.assertEqual(hairless_users[0]["name"], "Frosty")
-
-        # Delete all white-haired users
-        User.clear(hair="white")
-        self.assertFindResults(1)
-
-        # Wipe table
-        User.clear()
-        self.assertFindResults(0)
+        self.assertEqual([u["id"] for u in self.User.find(Attr("limit").eq(5))], ["1"])
+        self.assertEqual(self.User.count(Attr("parallel").eq("no")), 1)
+        self.User.clear(Attr("parallel").eq("yes"))
+        self.assertEqual([u["id"] for u in self.User.find()], ["2"])
+
+    def test_nested_dataclasses(self):
+        @dataclass
+        class Reindeer:
+            name: str
+
+        @dataclass
+        class Sleigh:
+            id: str
+            ts: int
+            lead: Reindeer
+            team: ty.List[Reindeer]
+            by_position: ty.Dict[str, Reindeer]
+
+        self.User.put(Sleigh("s", 1, Reindeer("Rudolph"), [Reindeer("Dasher")], {"left": Reindeer("Comet")}))
+        sleigh = self.User.get(id="s", ts=1)
+        self.assertEqual(sleigh["lead"], {"name": "Rudolph"})
+        self.assertEqual(sleigh["team"], [{"name": "Dasher"}])
+        self.assertEqual(sleigh["by_position"], {"left": {"name": "Comet"}})
 
     def test_dynamesa_with_typing(self):
-        User = dynamesa.tables.get("User", item_type=UserModel)
+        User = dynamesa.tables.get(USER_TABLE, item_type=UserModel)
 
         uid, uts = "1", 1600000000
-        User.put({"id": uid, "ts": uts, "name": "Jack Frost", "hair": "white", "nickname": "Jackie"})
-        User.put({"id": "2", "ts": 1700000000, "name": "Frosty", "hair": "none"})
-        User.put({"id": "3", "ts": 1500000000, "name": "Santa", "hair": "white"})
+        for user in SERIALIZED_SEED_USERS:
+            User.put_raw(user)
 
         self.assertFindResults(3)
 
@@ -185,7 +387,7 @@ class DynamoTests(unittest.TestCase):
 
 
 class TestMixinTests(dynamesa.DynamoUnitTestMixin, unittest.TestCase):
-    dynamesa_table_name_prefix = "dynamounittests-"
+    dynamesa_table_name_prefix = f"dynamounittests-{WORKER}-"
     dynamesa_tables = [
         ("User", ("id", "S", "ts", "N")),
         {
@@ -222,8 +424,24 @@ class TestMixinTests(dynamesa.DynamoUnitTestMixin, unittest.TestCase):
         self.tables.delete(table_xyz)
 
     def test_tables_created_with_name_prefix(self):
-        self.assertEqual(self.User.table.name, "dynamounittests-User")
-        self.assertEqual(self.Blog.table.name, "dynamounittests-Blog")
+        self.assertEqual(self.User.table.name, f"dynamounittests-{WORKER}-User")
+        self.assertEqual(self.Blog.table.name, f"dynamounittests-{WORKER}-Blog")
 
     def test_only_prefixed_tables_are_visible(self):
         self.assertEqual(len(dynamesa.tables), 2)
+
+    def test_len_skips_unprefixed_tables(self):
+        client = dynamesa.tables.dynamodb.meta.client
+        unprefixed = f"unprefixed-{WORKER}"
+        client.create_table(
+            TableName=unprefixed,
+            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        try:
+            dynamesa.tables.reload()
+            self.assertEqual(len(dynamesa.tables), len(list(dynamesa.tables)))
+            self.assertEqual(len(dynamesa.tables), 2)
+        finally:
+            client.delete_table(TableName=unprefixed)